@@ -1,24 +1,67 @@
-import os
 import json
+import string
 import streamlit as st
 import openai
-from dotenv import load_dotenv
-from scraper import fetch_data
+from selenium.common.exceptions import WebDriverException
+from config import get_secrets
+from intent import classify_intent
+from scraper import DriverPool, MorningstarClient, clear_cached_data, fetch_many_funds, fetch_multiple_data
 
-# load keys
-load_dotenv()
-
-# Try environment variables first, then Streamlit secrets
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# Environment variables first, then Streamlit secrets, resolved once per process
+openai.api_key = get_secrets()["OPENAI_API_KEY"]
 if not openai.api_key:
-    try:
-        openai.api_key = st.secrets["OPENAI_API_KEY"]
-    except:
-        st.error("Please set OPENAI_API_KEY in environment or Streamlit secrets")
-        st.stop()
+    st.error("Please set OPENAI_API_KEY in environment or Streamlit secrets")
+    st.stop()
+
+@st.cache_resource
+def get_driver_pool():
+    """Logged-in browser pool that survives Streamlit reruns"""
+    return DriverPool()
+
+@st.cache_resource
+def get_http_client():
+    """Cookie-authenticated HTTP client kept open across reruns"""
+    client = MorningstarClient()
+    # Reuse the last browser login so the static-HTML path can run before Chrome has started
+    client.load_saved_session()
+    return client
+
+class IncompleteFetch(Exception):
+    """Raised inside the memoized lookup so failed scrapes are not cached"""
+    def __init__(self, results):
+        super().__init__("fund data lookup returned errors")
+        self.results = results
+
+def has_errors(results):
+    values = []
+    for value in results.values():
+        values.extend(value.values() if isinstance(value, dict) else [value])
+    return any(str(v).startswith("Error") for v in values)
+
+@st.cache_data(ttl=3600, max_entries=512, show_spinner=False)
+def lookup_fund_data(funds: tuple, data_points: tuple, _pool, _client):
+    """Memoized fund lookup for repeat queries within this process"""
+    if len(funds) > 1:
+        # Look up several funds side by side, keyed by fund name
+        results = fetch_many_funds(list(funds), list(data_points), pool=_pool, client=_client)
+    else:
+        # Fetch all data points in a single pooled session
+        results = fetch_multiple_data(funds[0], list(data_points), pool=_pool, client=_client)
+    if has_errors(results):
+        raise IncompleteFetch(results)
+    return results
+
+@st.cache_resource
+def known_funds():
+    """Fund names resolved by the model so far, matched locally on later queries"""
+    return set()
 
 st.title("NFA ChatBot")
 query = st.text_input("Enter your query about a fund:")
+if st.button("Refresh fund data"):
+    # Drop memoized and on-disk values so this query scrapes again
+    lookup_fund_data.clear()
+    clear_cached_data()
 
 def get_function_schema():
     return [
@@ -32,6 +75,11 @@ def get_function_schema():
                         "type": "string",
                         "description": "The name of the fund to look up"
                     },
+                    "funds": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "All fund names when the query compares or covers more than one fund"
+                    },
                     "data_points": {
                         "type": "array",
                         "items": {
@@ -43,52 +91,104 @@ def get_function_schema():
                 },
                 "required": ["fund", "data_points"]
             }
+        },
+        {
+            "name": "compose_response",
+            "description": "Draft the advisor-ready response in the same turn as the data lookup. Refer to fetched values only through the placeholders {mer}, {performance} and {fund_profile}; they are filled in once the data is retrieved.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "template": {
+                        "type": "string",
+                        "description": "Professional, factual response text without salutations, signatures or investment advice, using the placeholders for any fund data"
+                    }
+                },
+                "required": ["template"]
+            }
         }
     ]
 
+def get_tool_schema():
+    return [{"type": "function", "function": schema} for schema in get_function_schema()]
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def detect_intent(user_query):
+    """Pick the data to fetch and draft the response around it in a single completion"""
+    intent_response = openai.ChatCompletion.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You are an assistant that determines what fund data is needed for advisor queries. Always identify the fund name. For buy/sell questions, always fetch the fund_profile. Call get_fund_data and compose_response together so the response can be completed without another request."},
+            {"role": "user", "content": user_query}
+        ],
+        tools=get_tool_schema(),
+        tool_choice="required",
+        parallel_tool_calls=True
+    )
+    
+    message = intent_response.choices[0].message
+    calls = {}
+    for tool_call in message.get("tool_calls") or []:
+        calls[tool_call["function"]["name"]] = json.loads(tool_call["function"]["arguments"])
+    return {"calls": calls, "content": message.get("content")}
+
+def render_template(template, fund_data):
+    """Fill a drafted response with scraped values, or None if it cannot be used as-is"""
+    if not template or has_errors(fund_data):
+        return None
+    try:
+        fields = [(name, conversion) for _, name, _, conversion in string.Formatter().parse(template) if name is not None]
+    except ValueError:
+        return None
+    # The draft is written before any data exists: it must place every fetched value through
+    # plain {data_point} fields (no attribute or index lookups), or its figures are the model's own
+    names = {name for name, _ in fields}
+    if names != set(fund_data) or any(not name.isidentifier() or conversion for name, conversion in fields):
+        return None
+    try:
+        return template.format_map(fund_data)
+    except (KeyError, IndexError, ValueError):
+        return None
+
+def fund_names(arguments):
+    """Funds named in a get_fund_data call, whether given singly or as a list"""
+    funds = arguments.get("funds") or []
+    if isinstance(arguments.get("fund"), list):
+        funds = arguments["fund"] + funds
+    elif arguments.get("fund"):
+        funds = [arguments["fund"]] + funds
+    # Drop repeats while keeping the order the model gave
+    return list(dict.fromkeys(funds))
+
 def execute_function_call(function_name, arguments):
     """Execute the function call and return results"""
     if function_name == "get_fund_data":
-        fund = arguments.get("fund")
+        funds = fund_names(arguments)
         data_points = arguments.get("data_points", [])
         
-        with st.spinner(f"Looking up {fund} data..."):
+        with st.spinner(f"Looking up {', '.join(funds)} data..."):
             try:
-                # Import the new function
-                from scraper import fetch_multiple_data
-                # Fetch all data points in a single session
-                results = fetch_multiple_data(fund, data_points)
-            except ImportError:
-                # Fallback to old method if new function not available
-                results = {}
-                for data_point in data_points:
-                    try:
-                        results[data_point] = fetch_data(fund, data_point)
-                    except Exception as e:
-                        results[data_point] = f"Error: {str(e)}"
+                # Tuples keep the memo key stable however the arguments were built
+                results = lookup_fund_data(tuple(funds), tuple(data_points), get_driver_pool(), get_http_client())
+            except IncompleteFetch as e:
+                results = e.results
+            except WebDriverException:
+                # Chrome itself failed to start; rebuild the pool on the next query
+                get_driver_pool().close()
+                get_driver_pool.clear()
+                raise
         
         return results
     return None
 
-def get_conversational_response(user_query, fund_data, fund_name):
-    """Generate a professional response that advisors can use in client communications"""
-    
-    # Format the data for the prompt
-    data_text = ""
-    if "mer" in fund_data:
-        data_text += f"Management Expense Ratio (MER): {fund_data['mer']}\n"
-    if "performance" in fund_data:
-        data_text += f"1-Year Performance: {fund_data['performance']}\n"
-    if "fund_profile" in fund_data:
-        data_text += f"Fund Profile: {fund_data['fund_profile']}\n"
-    
-    # Create a professional prompt
-    prompt = f"""Based on the following Morningstar data about {fund_name}, provide a professional response that a financial advisor can use when writing to their client.
-
-Query: {user_query}
+# Prompt labels for each data point, in the order they are presented
+LABELS = {
+    "mer": "Management Expense Ratio (MER)",
+    "performance": "1-Year Performance",
+    "fund_profile": "Fund Profile",
+}
 
-Fund Data:
-{data_text}
+# Static instructions live in the system message so each query only sends its own data
+RESPONSE_SYSTEM_PROMPT = """You are generating professional financial content for advisors to use in client communications, based on Morningstar fund data.
 
 Instructions:
 - Write professional, factual content without salutations or signatures
@@ -101,49 +201,74 @@ Instructions:
 - Do not provide investment advice or recommendations
 - Write in a neutral, professional tone that can be incorporated into a larger email/letter"""
 
+def format_fund_data(fund_data):
+    """Format one fund's data points for the prompt"""
+    return "\n".join(f"{LABELS[k]}: {fund_data[k]}" for k in LABELS if k in fund_data)
+
+def get_conversational_response(user_query, fund_data, fund_name):
+    """Stream a professional response that advisors can use in client communications"""
+    
+    # Format the data for the prompt, one section per fund for multi-fund lookups
+    if fund_data and all(isinstance(v, dict) for v in fund_data.values()):
+        data_text = "\n\n".join(f"{name}:\n{format_fund_data(data)}" for name, data in fund_data.items())
+    else:
+        data_text = format_fund_data(fund_data)
+    
+    prompt = f"{user_query}\n\nData for {fund_name}:\n{data_text}"
+
     response = openai.ChatCompletion.create(
         model="gpt-4o-mini",
         messages=[
-            {"role": "system", "content": "You are generating professional financial content for advisors to use in client communications. Provide factual, concise information without greetings or signatures."},
+            {"role": "system", "content": RESPONSE_SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
-        temperature=0.3
+        temperature=0.3,
+        max_tokens=250,
+        response_format={"type": "text"},
+        stream=True
     )
     
-    return response.choices[0].message.content
+    # Render tokens as they arrive instead of waiting for the full completion
+    placeholder = st.empty()
+    acc = ""
+    for chunk in response:
+        acc += chunk.choices[0].delta.get("content") or ""
+        placeholder.markdown(acc)
+    
+    return acc
 
 if query:
     try:
-        # First, use OpenAI to understand intent and determine what data to fetch
-        intent_response = openai.ChatCompletion.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an assistant that determines what fund data is needed for advisor queries. Always identify the fund name. For buy/sell questions, always fetch the fund_profile."},
-                {"role": "user", "content": query}
-            ],
-            functions=get_function_schema(),
-            function_call="auto"
-        )
+        # Clear-cut queries are classified locally; otherwise one completion decides
+        # what to fetch and drafts the response, and repeat queries skip it
+        arguments = classify_intent(query, known_funds())
+        template = None
+        content = None
+        if arguments is None:
+            intent = detect_intent(query)
+            arguments = intent["calls"].get("get_fund_data")
+            template = intent["calls"].get("compose_response", {}).get("template")
+            content = intent["content"]
+            if arguments:
+                known_funds().update(fund_names(arguments))
         
-        message = intent_response.choices[0].message
-        
-        if message.get("function_call"):
-            # Parse the function call
-            function_name = message["function_call"]["name"]
-            arguments = json.loads(message["function_call"]["arguments"])
-            
+        if arguments:
             # Execute the function to get data
-            fund_data = execute_function_call(function_name, arguments)
+            fund_data = execute_function_call("get_fund_data", arguments)
+            funds = fund_names(arguments)
             
             if fund_data:
-                # Generate conversational response
-                response = get_conversational_response(query, fund_data, arguments.get("fund"))
-                st.write(response)
+                # Fill the drafted response locally, only asking the model again when it does not fit
+                response = render_template(template, fund_data) if len(funds) == 1 else None
+                if response is None:
+                    get_conversational_response(query, fund_data, ", ".join(funds))
+                else:
+                    st.write(response)
             else:
                 st.write("Unable to retrieve the requested fund data. Please verify the fund name and try again.")
         else:
-            # No function call needed - provide direct response
-            st.write(message["content"])
+            # No fund data needed - provide direct response
+            st.write(template or content)
             
     except Exception as e:
         st.error(f"Error: {str(e)}")
@@ -0,0 +1,56 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+class FileCache:
+    """On-disk cache of fund data, one JSON file per fund and data point"""
+
+    def __init__(self, directory, ttls: dict, default_ttl: float = 3600):
+        self.directory = Path(directory)
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+
+    def _path(self, fund: str, data_point: str) -> Path:
+        fund_hash = hashlib.md5(fund.strip().lower().encode("utf-8")).hexdigest()
+        return self.directory / f"{fund_hash}_{data_point}.json"
+
+    def get(self, fund: str, data_point: str):
+        """Return the cached value, or None if missing or expired"""
+        try:
+            with open(self._path(fund, data_point), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        ttl = self.ttls.get(data_point, self.default_ttl)
+        if time.time() - entry.get("timestamp", 0) > ttl:
+            return None
+        return entry.get("value")
+
+    def set(self, fund: str, data_point: str, value):
+        path = self._path(fund, data_point)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file first so concurrent readers never see a partial entry; the name
+        # is unique per writer, as threads of one process may write the same key at once
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.directory,
+                                         prefix=path.stem + ".", suffix=".tmp", delete=False) as f:
+            json.dump({"value": value, "timestamp": time.time()}, f)
+        os.replace(f.name, path)
+
+    def delete(self, fund: str, data_point: str):
+        try:
+            os.remove(self._path(fund, data_point))
+        except FileNotFoundError:
+            pass
+
+    def clear(self, data_point: str):
+        """Drop the cached value of data_point for every fund"""
+        # Names are a 32-character md5 hex digest, "_", then the data point
+        for path in self.directory.glob("?" * 32 + f"_{data_point}.json"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,33 @@
+import functools
+import os
+from pathlib import Path
+from types import MappingProxyType
+
+import streamlit as st
+from dotenv import load_dotenv
+
+# Loaded on import, before scraper.py reads its module-level settings (SCRAPER_BACKEND,
+# SELENIUM_REMOTE_URL, MAX_CONCURRENCY) from the environment; this touches no Streamlit state
+load_dotenv(dotenv_path=Path(__file__).parent / ".env")
+
+SECRET_NAMES = (
+    "OPENAI_API_KEY",
+    "MORNINGSTAR_USERNAME",
+    "MORNINGSTAR_PASSWORD",
+    "MORNINGSTAR_COOKIE_KEY",
+)
+
+@functools.lru_cache(maxsize=1)
+def get_secrets():
+    """Resolve secrets once per process: environment and .env first, then Streamlit secrets"""
+    secrets = {}
+    for name in SECRET_NAMES:
+        value = os.getenv(name)
+        if not value:
+            try:
+                value = st.secrets[name]
+            except (KeyError, FileNotFoundError):
+                # No such secret, or no secrets.toml at all
+                value = None
+        secrets[name] = value
+    return MappingProxyType(secrets)
@@ -0,0 +1,66 @@
+import re
+
+# Keyword -> data point rules for the local intent classifier
+DATA_POINT_PATTERNS = {
+    "mer": re.compile(r"\b(?:mer|costs?|expenses?|fees?)\b", re.IGNORECASE),
+    "performance": re.compile(r"\b(?:returns?|returned|performance|performed|1\s*-?\s*(?:yr|year))\b", re.IGNORECASE),
+    "fund_profile": re.compile(r"\b(?:buy|sell|strategy|profile)\b", re.IGNORECASE),
+}
+# Capitalised name following "of", "for", "buy", ... e.g. "MER of Vanguard High Growth";
+# it ends at sentence punctuation, and "and" separates funds rather than joining a name
+FUND_NAME_PATTERN = re.compile(
+    r"\b(?:of|for|about|on|buy|sell|hold|into)\s+(?:the\s+)?"
+    r"(?P<fund>[A-Z0-9][\w&'\-]*(?:\s+(?:(?:of|&)\s+)?[A-Z0-9][\w&'\-]*)*)"
+)
+MULTI_FUND_PATTERN = re.compile(r"\b(?:compare|comparison|versus|vs\.?)\b", re.IGNORECASE)
+# "IOZ and VAS", "Vanguard High Growth, Vanguard Balanced": a list of names is left to the model
+FUND_LIST_PATTERN = re.compile(r"(?:,|\band\b)\s*(?:the\s+)?[A-Z0-9]")
+
+
+def _is_data_point(text):
+    return any(pattern.fullmatch(text) for pattern in DATA_POINT_PATTERNS.values())
+
+def _strip_data_points(name):
+    """Drop trailing data-point keywords and a possessive, e.g. "Vanguard's MER" -> "Vanguard" """
+    words = name.split()
+    while words:
+        if _is_data_point(words[-1]):
+            del words[-1]
+        elif len(words) > 1 and _is_data_point(" ".join(words[-2:])):
+            # Two-word keywords such as "1 Yr"
+            del words[-2:]
+        else:
+            break
+    return re.sub(r"'s$", "", " ".join(words)).rstrip("'")
+
+def classify_intent(user_query, known_funds=()):
+    """Extract get_fund_data arguments without the model, or None if the query is not clear-cut"""
+    if MULTI_FUND_PATTERN.search(user_query) or FUND_LIST_PATTERN.search(user_query):
+        return None
+    data_points = [dp for dp, pattern in DATA_POINT_PATTERNS.items() if pattern.search(user_query)]
+    if not data_points:
+        return None
+
+    # Known names only count as whole words, so "IOZ" does not match inside "BIOZ Fund"
+    matches = [
+        name for name in sorted(known_funds, key=len, reverse=True)
+        if re.search(rf"(?<!\w){re.escape(name)}(?!\w)", user_query, re.IGNORECASE)
+    ]
+    known = matches[0] if matches else None
+    # Several known funds, other than ones inside the longest match, is a multi-fund query
+    if any(name.lower() not in known.lower() for name in matches[1:]):
+        return None
+    typed = None
+    match = FUND_NAME_PATTERN.search(user_query)
+    if match:
+        # "about MER" names a data point, not a fund
+        typed = _strip_data_points(match.group("fund")) or None
+    # A longer typed name wins over a shorter known one it extends, e.g. "Vanguard Diversified
+    # High Growth" over "Vanguard", so a more specific fund is never swapped for a known one
+    if typed and (known is None or len(typed) > len(known) or known.lower() in typed.lower()):
+        fund = typed
+    else:
+        fund = known
+    if fund is None:
+        return None
+    return {"fund": fund, "data_points": data_points}
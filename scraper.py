@@ -1,23 +1,67 @@
+import atexit
+import functools
+import json
+import logging
 import os
-from dotenv import load_dotenv
+import shutil
+import httpx
+import lxml.etree
+import lxml.html
+from cryptography.fernet import Fernet, InvalidToken
+from filelock import FileLock, Timeout
+from cache import FileCache
+from config import get_secrets
 from selenium import webdriver
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urljoin
+import queue
+import tempfile
+import threading
 import time
+import weakref
 
-# Load environment variables
-env_path = Path(__file__).parent / ".env"
-load_dotenv(dotenv_path=env_path)
+try:
+    # Optional backend: pip install playwright && playwright install chromium
+    from playwright.sync_api import Error as PlaywrightError, sync_playwright
+except ImportError:
+    sync_playwright = None
 
-# Morningstar credentials
-USERNAME = os.getenv("MORNINGSTAR_USERNAME")
-PASSWORD = os.getenv("MORNINGSTAR_PASSWORD")
-if not USERNAME or not PASSWORD:
-    raise ValueError("Please set MORNINGSTAR_USERNAME and MORNINGSTAR_PASSWORD in .env")
+# Secrets are resolved on first use rather than at import, so importing this module
+# (and Streamlit hot reloads) never touches .env or secrets.toml
+@functools.lru_cache(maxsize=1)
+def _creds() -> tuple:
+    """Morningstar (username, password)"""
+    secrets = get_secrets()
+    username, password = secrets["MORNINGSTAR_USERNAME"], secrets["MORNINGSTAR_PASSWORD"]
+    if not username or not password:
+        raise ValueError("Please set MORNINGSTAR_USERNAME and MORNINGSTAR_PASSWORD in .env or Streamlit secrets")
+    return username, password
+
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=1)
+def _cookie_fernet():
+    """Fernet for the persisted login cookies; without a valid key cookies are never written to disk"""
+    key = get_secrets()["MORNINGSTAR_COOKIE_KEY"]
+    if not key:
+        return None
+    try:
+        return Fernet(key)
+    except ValueError:
+        # Persistence only saves logins; a bad key must not break them
+        logger.warning("MORNINGSTAR_COOKIE_KEY is not a valid Fernet key; login cookies will not be persisted")
+        return None
+
+COOKIE_FILE = Path.home() / ".cache" / "morningstar_cookies.json"
+COOKIE_MAX_AGE = 12 * 3600
 
 # XPATH configuration
 XPATHS = {
@@ -27,130 +71,882 @@ XPATHS = {
     "fund_profile":        "//div[@class='sal-mip-strategy-content']//div[@class='sal-mip-strategy__body']",
 }
 
-def get_driver():
+# Compiled once for lxml parsing of page snapshots
+COMPILED_XPATHS = {k: lxml.etree.XPath(v) for k, v in XPATHS.items()}
+
+# In-browser equivalents of XPATHS: plain CSS where the structure is enough, otherwise
+# the sal-dp-name label of a sal-dp-pair block, matched in one pass over the pairs
+BROWSER_SELECTORS = {
+    "mer":          {"label": "Total Cost Ratio (Prospective)"},
+    "performance":  {"label": "1 Yr Return"},
+    "fund_profile": {"css": "div.sal-mip-strategy-content div.sal-mip-strategy__body"},
+}
+
+HOME_URL = "https://premium.morningstar.com.au/"
+
+# "playwright" drives Chrome over CDP with Playwright when it is installed; anything else uses Selenium
+SCRAPER_BACKEND = os.getenv("SCRAPER_BACKEND", "selenium")
+
+# Selenium Grid hub to run browsers on, e.g. http://selenium-hub:4444/wd/hub
+SELENIUM_REMOTE_URL = os.getenv("SELENIUM_REMOTE_URL")
+
+# Subresources the extraction never needs; blocking them cuts page-load time
+BLOCKED_URLS = [
+    # Images, fonts, styles and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff*", "*.ttf", "*.otf", "*.eot", "*.css",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+    # Analytics, ads and trackers
+    "*/analytics/*", "*/gtag/*", "*google-analytics*", "*doubleclick*", "*hotjar*", "*facebook.net*",
+]
+
+# Playwright aborts these by resource type, which also catches assets served without an extension
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
+REMOVE_POPUP_JS = "var el=document.getElementById('subscription-notification'); if(el) el.remove();"
+
+# Installed once per document so the subscription pop-up is removed as soon as it appears;
+# safe to run again on a document that already has it
+POPUP_REAPER_JS = (
+    REMOVE_POPUP_JS +
+    "window.__popupReaper = window.__popupReaper || new MutationObserver(function () {" + REMOVE_POPUP_JS + "});"
+    "window.__popupReaper.observe(document, {childList: true, subtree: true});"
+)
+
+# Installed once per document alongside the reaper: window.__extract(keys) resolves data-point
+# keys against BROWSER_SELECTORS, compiled into the page, and returns {key: visible text or null},
+# so extraction calls send only key names
+EXTRACTOR_JS = """
+window.__extract = window.__extract || (function (selectors) {
+    return function (keys) {
+        const pairs = {};
+        for (const pair of document.querySelectorAll('div.sal-dp-pair')) {
+            const name = pair.querySelector('div.sal-dp-name');
+            const value = pair.querySelector('div.sal-dp-value');
+            if (!name || !value) continue;
+            // First pair in document order wins, as with the XPaths on the HTTP path
+            const label = name.textContent.replace(/\\s+/g, ' ').trim();
+            if (!(label in pairs)) pairs[label] = value.innerText.trim();
+        }
+        const out = {};
+        for (const key of keys) {
+            const spec = selectors[key];
+            if (spec.label !== undefined) {
+                out[key] = pairs[spec.label] || null;
+            } else {
+                const node = document.querySelector(spec.css);
+                out[key] = node ? node.innerText.trim() : null;
+            }
+        }
+        return out;
+    };
+})(%s);
+""" % json.dumps(BROWSER_SELECTORS)
+
+PAGE_SCRIPTS_JS = POPUP_REAPER_JS + EXTRACTOR_JS
+
+# How long scraped values stay fresh, in seconds
+CACHE_TTLS = {
+    "mer":          24 * 3600,
+    "performance":  3600,
+    "fund_profile": 7 * 24 * 3600,
+    # Fund page URLs found through the search bar rarely change
+    "fund_url":     30 * 24 * 3600,
+}
+CACHE = FileCache(Path(__file__).parent / ".cache", CACHE_TTLS)
+
+def clear_cached_data():
+    """Forget every scraped value so the next lookups fetch fresh data; fund URLs are kept"""
+    for data_point in BROWSER_SELECTORS:
+        CACHE.clear(data_point)
+
+# Browser sessions run side by side for multi-fund lookups, and idle drivers kept per pool;
+# raise it to match the session capacity of a Selenium Grid
+MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "5"))
+
+# Pooled sessions older than this are logged in again before reuse
+SESSION_MAX_AGE = 30 * 60
+# Chrome processes older than this are replaced, bounding leaks in long-lived browsers
+DRIVER_MAX_LIFETIME = 4 * 3600
+
+# Keep webdriver-manager downloads in the project's .wdm cache
+os.environ.setdefault("WDM_LOCAL", "1")
+
+@functools.lru_cache(maxsize=1)
+def chromedriver_path() -> str:
+    """Resolve chromedriver once per process; set CHROMEDRIVER_PATH to skip webdriver-manager"""
+    # packages.txt installs a system chromedriver next to chromium on Streamlit Cloud
+    return os.getenv("CHROMEDRIVER_PATH") or shutil.which("chromedriver") or ChromeDriverManager().install()
+
+@functools.lru_cache(maxsize=1)
+def chrome_binary():
+    """Resolve the Chrome binary once per process, or None to let chromedriver find it"""
+    if os.getenv("CHROME_BINARY"):
+        return os.getenv("CHROME_BINARY")
+    # google-chrome-stable in the Docker image, Debian chromium from packages.txt elsewhere
+    for name in ("google-chrome-stable", "chromium", "chromium-browser"):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+# Chrome profiles reused by successive drivers so cached assets and cookies stay warm
+PROFILE_ROOT = tempfile.mkdtemp(prefix="ms-profile-")
+# Registered before shutdown_pool below, so it runs after every Chrome has quit
+atexit.register(shutil.rmtree, PROFILE_ROOT, ignore_errors=True)
+
+def claim_profile():
+    """Lock the first free profile directory; Chrome refuses to share one between processes"""
+    slot = 0
+    while True:
+        profile_dir = os.path.join(PROFILE_ROOT, f"slot-{slot}")
+        lock = FileLock(profile_dir + ".lock", thread_local=False)
+        try:
+            lock.acquire(timeout=0)
+            return profile_dir, lock
+        except Timeout:
+            slot += 1
+
+# Shared by the Selenium and Playwright launches: container-safe flags, then background
+# services a scraping session never uses, which slow every Chrome start
+CHROME_FLAGS = [
+    "--no-sandbox", "--disable-dev-shm-usage",
+    "--disable-background-networking", "--disable-sync", "--disable-default-apps",
+    "--disable-translate", "--metrics-recording-only", "--mute-audio", "--no-first-run",
+]
+
+def get_driver(profile_dir: str = None):
     """Create a new Chrome driver instance"""
     opts = Options()
-    opts.add_argument("--headless")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--headless=new")
     opts.add_argument("--disable-gpu")
     opts.add_argument("--disable-features=VizDisplayCompositor")
     opts.add_argument("--log-level=3")
+    for flag in CHROME_FLAGS:
+        opts.add_argument(flag)
+    # Return from driver.get as soon as navigation starts; explicit waits gate on the elements
+    # we need while ads and trackers keep loading
+    opts.set_capability("pageLoadStrategy", "none")
+    opts.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.stylesheets": 2,
+    })
     
-    # Set Chrome binary location for Docker
-    opts.binary_location = "/usr/bin/google-chrome-stable"
+    if profile_dir:
+        opts.add_argument(f"--user-data-dir={profile_dir}")
     
-    service = Service(log_path=os.devnull)
-    driver = webdriver.Chrome(service=service, options=opts)
+    if SELENIUM_REMOTE_URL:
+        driver = webdriver.Remote(command_executor=SELENIUM_REMOTE_URL, options=opts)
+    else:
+        if chrome_binary():
+            opts.binary_location = chrome_binary()
+        service = Service(executable_path=chromedriver_path(), log_path=os.devnull)
+        driver = webdriver.Chrome(service=service, options=opts)
+        # CDP is only available on local drivers; remote sessions rely on the prefs above
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": PAGE_SCRIPTS_JS})
+        driver.__dict__["_page_scripts"] = True
     driver.set_window_size(1920, 1080)
+    driver.set_page_load_timeout(15)
     return driver
 
+def wait_ready(driver, by, sel, timeout: float = 15):
+    """Block until an element is in the DOM and return it"""
+    return WebDriverWait(driver, timeout).until(EC.presence_of_element_located((by, sel)))
+
+def retry_wait(driver, cond, timeout: float = 5, attempts: int = 3, recover=None):
+    """Wait for cond in short rounds, reloading the page (or calling recover) between them.
+
+    A transient SPA hiccup costs one short round instead of a single long timeout.
+    """
+    for attempt in range(attempts):
+        try:
+            return WebDriverWait(driver, timeout).until(cond)
+        except TimeoutException:
+            if attempt == attempts - 1:
+                raise
+            if recover is not None:
+                recover()
+            else:
+                # With the 'none' strategy driver.refresh() returns before the reload; navigate waits it out
+                navigate(driver, driver.current_url)
+
 def login(driver):
     """Your working login function"""
-    driver.get("https://premium.morningstar.com.au/auth/logout")
+    username, password = _creds()
+    navigate(driver, "https://premium.morningstar.com.au/auth/logout")
     wait = WebDriverWait(driver, 15)
     # Open login form
     sign_in = wait.until(EC.element_to_be_clickable((By.XPATH, "//span[text()='Sign-In']")))
     sign_in.click()
     # Enter email and continue
-    email_field = wait.until(EC.presence_of_element_located((By.ID, "username")))
-    email_field.send_keys(USERNAME)
+    email_field = wait_ready(driver, By.ID, "username")
+    email_field.send_keys(username)
     wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@class,'_button-login-id')]"))).click()
     # Enter password and submit
-    pwd_field = wait.until(EC.presence_of_element_located((By.ID, "password")))
-    pwd_field.send_keys(PASSWORD)
+    pwd_field = wait_ready(driver, By.ID, "password")
+    pwd_field.send_keys(password)
     wait.until(EC.element_to_be_clickable((By.XPATH, "//button[contains(@class,'_button-login-password')]"))).click()
     # Confirm login via search bar
-    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'input[placeholder="Search..."]')))
-
-def click_and_extract(driver, xpath: str) -> str:
-    wait = WebDriverWait(driver, 10)
-    # Dismiss subscription pop-up if present
-    driver.execute_script(
-        "var el=document.getElementById('subscription-notification'); if(el) el.remove();"
-    )
-    # Select Overview tab
-    wait.until(EC.element_to_be_clickable((By.XPATH, XPATHS["overview_tab"]))).click()
-    # Return text of target section
-    elem = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-    return elem.text.strip()
+    wait_ready(driver, By.CSS_SELECTOR, 'input[placeholder="Search..."]')
 
-def fetch_data(fund: str, data_point: str) -> str:
-    # Create a fresh driver for each request
-    driver = get_driver()
+def save_cookies(driver):
+    """Persist the session cookies, encrypted, so later processes can skip login"""
+    fernet = _cookie_fernet()
+    if fernet is None:
+        return
+    session = {"cookies": driver.get_cookies(), "user_agent": driver.execute_script("return navigator.userAgent")}
+    token = fernet.encrypt(json.dumps(session).encode("utf-8"))
+    COOKIE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    # One temp file per writer: concurrent first logins in this process may save at once
+    with tempfile.NamedTemporaryFile(dir=COOKIE_FILE.parent, prefix=COOKIE_FILE.stem + ".",
+                                     suffix=".tmp", delete=False) as f:
+        f.write(token)
+    os.replace(f.name, COOKIE_FILE)
+
+def load_saved_session():
+    """Persisted {"cookies", "user_agent"} of a logged-in browser, or None if missing or expired"""
+    fernet = _cookie_fernet()
+    if fernet is None:
+        return None
     try:
-        # Login
-        login(driver)
-        wait = WebDriverWait(driver, 15)
-        # Search fund
-        main_search = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[placeholder="Search..."]')))
-        main_search.click()
-        
-        # Wait for secondary search input
-        sec_search = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[placeholder="Search securities and site"]')))
-        sec_search.clear()
-        sec_search.send_keys(fund)
-        time.sleep(1)  # Allow suggestions to load
-        
-        # Click first suggestion
-        suggestion = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'div.mds-search-results__mca.search-results__mca ul.mds-list-group__mca li a')))
-        suggestion.click()
-        
-        # Wait for overview tab
-        wait.until(EC.presence_of_element_located((By.XPATH, XPATHS['overview_tab'])))
-        time.sleep(1)
-        
-        # Extract data using click_and_extract
-        text = click_and_extract(driver, XPATHS[data_point])
-        return text
-        
-    except Exception as e:
-        return f"Error fetching {data_point}: {str(e)}"
-    finally:
-        # Always close the driver
-        driver.quit()
+        if time.time() - COOKIE_FILE.stat().st_mtime > COOKIE_MAX_AGE:
+            return None
+        session = json.loads(fernet.decrypt(COOKIE_FILE.read_bytes()))
+    except (OSError, InvalidToken, ValueError):
+        return None
+    # Files from before the user agent was stored hold a bare cookie list
+    return session if isinstance(session, dict) else None
 
-def fetch_multiple_data(fund: str, data_points: list) -> dict:
-    """Fetch multiple data points in a single session"""
-    driver = get_driver()
-    results = {}
+def restore_cookies(driver) -> bool:
+    """Load persisted cookies into the driver and report whether they still log us in"""
+    session = load_saved_session()
+    if session is None:
+        return False
     
+    navigate(driver, HOME_URL)
+    for cookie in session["cookies"]:
+        try:
+            driver.add_cookie(cookie)
+        except WebDriverException:
+            # Cookies for the separate sign-in domain cannot be set from this page
+            pass
+    # Reload through navigate so the probe below only sees the new document
+    navigate(driver, HOME_URL)
     try:
-        # Login once
+        wait_ready(driver, By.CSS_SELECTOR, 'input[placeholder="Search..."]', timeout=5)
+        return True
+    except TimeoutException:
+        return False
+
+def start_session(driver):
+    """Log in, reusing persisted cookies while they are still accepted"""
+    if not restore_cookies(driver):
         login(driver)
-        wait = WebDriverWait(driver, 15)
-        
-        # Search fund
-        main_search = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[placeholder="Search..."]')))
-        main_search.click()
-        
-        # Wait for secondary search input
-        sec_search = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[placeholder="Search securities and site"]')))
-        sec_search.clear()
-        sec_search.send_keys(fund)
-        time.sleep(1)  # Allow suggestions to load
-        
-        # Click first suggestion
-        suggestion = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'div.mds-search-results__mca.search-results__mca ul.mds-list-group__mca li a')))
-        suggestion.click()
-        
-        # Wait for overview tab
-        wait.until(EC.presence_of_element_located((By.XPATH, XPATHS['overview_tab'])))
-        time.sleep(1)
+        save_cookies(driver)
+
+def navigate(driver, url: str):
+    """Load a page, forgetting tab state from the previous one"""
+    # driver.get returns before the new document exists, so wait for the old one to go
+    # away; otherwise later waits could match elements of the page being left
+    try:
+        old_page = driver.find_element(By.TAG_NAME, "html")
+    except WebDriverException:
+        old_page = None
+    driver.get(url)
+    if old_page is not None:
+        WebDriverWait(driver, 15).until(EC.staleness_of(old_page))
+    driver.__dict__["_on_overview"] = False
+    # Local drivers get the page scripts in every document through CDP; elsewhere install them here
+    if not driver.__dict__.get("_page_scripts"):
+        driver.execute_script(PAGE_SCRIPTS_JS)
+
+def open_overview(driver):
+    """Select the Overview tab unless this page is already showing it"""
+    if driver.__dict__.get("_on_overview"):
+        return
+    retry_wait(driver, EC.element_to_be_clickable((By.XPATH, XPATHS["overview_tab"]))).click()
+    driver.__dict__["_on_overview"] = True
+
+def extract_all(driver, data_points: list) -> dict:
+    """Read several data points in one WebDriver round trip, skipping any with no text yet"""
+    texts = driver.execute_script("return window.__extract(arguments[0]);", list(data_points))
+    return {key: text for key, text in texts.items() if text}
+
+def locator(data_point: str) -> tuple:
+    """Selenium locator for a data point, CSS unless it needs a text match"""
+    spec = BROWSER_SELECTORS[data_point]
+    if "css" in spec:
+        return (By.CSS_SELECTOR, spec["css"])
+    return (By.XPATH, XPATHS[data_point])
+
+def wait_for_data_points(driver, data_points: list, timeout: float = 10) -> dict:
+    """Poll for several data points under one shared deadline, returning those that appeared"""
+    found = {}
+    def all_found(d):
+        # One script call per poll, however many data points are still outstanding
+        pending = [dp for dp in data_points if dp not in found]
+        found.update(extract_all(d, pending))
+        return len(found) == len(data_points)
+    try:
+        WebDriverWait(driver, timeout).until(all_found)
+    except TimeoutException:
+        pass
+    return found
+
+class DriverPool:
+    """Pool of logged-in Chrome drivers reused across queries"""
+
+    def __init__(self, size: int = MAX_CONCURRENCY, max_age: float = SESSION_MAX_AGE,
+                 max_lifetime: float = DRIVER_MAX_LIFETIME, refresh_interval: float = 60):
+        self.max_age = max_age
+        self.max_lifetime = max_lifetime
+        self.refresh_interval = refresh_interval
+        self._pool = queue.Queue(maxsize=size)
+        # Every driver this pool started and has not closed, idle or checked out
+        self._live = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        _pools.add(self)
+        # Re-login idle drivers in the background so queries rarely pay for it
+        self._refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        self._refresher.start()
+
+    def is_stale(self, entry: dict) -> bool:
+        return time.time() - entry["logged_in_at"] > self.max_age
+
+    def is_expired(self, entry: dict) -> bool:
+        return time.time() - entry["created_at"] > self.max_lifetime
+
+    def acquire(self) -> dict:
+        """Take an idle driver from the pool, or start a new one"""
+        while True:
+            try:
+                entry = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            if not self.is_expired(entry):
+                return entry
+            self.discard(entry)
+        # Profiles live on the browser host, so remote sessions keep their own
+        profile_dir, profile_lock = (None, None) if SELENIUM_REMOTE_URL else claim_profile()
+        try:
+            driver = get_driver(profile_dir)
+        except Exception:
+            if profile_lock:
+                profile_lock.release()
+            raise
+        entry = {"driver": driver, "created_at": time.time(), "last_used": 0.0,
+                 "logged_in_at": 0.0, "profile_lock": profile_lock}
+        with self._lock:
+            self._live.append(entry)
+        return entry
+
+    def release(self, entry: dict):
+        """Return a healthy driver to the pool"""
+        entry["last_used"] = time.time()
+        try:
+            # Cheap round trip to make sure the browser is still answering
+            entry["driver"].current_url
+        except WebDriverException:
+            self.discard(entry)
+            return
+        with self._lock:
+            if self._closed.is_set() or self.is_expired(entry):
+                keep = False
+            else:
+                try:
+                    self._pool.put_nowait(entry)
+                    keep = True
+                except queue.Full:
+                    keep = False
+        if not keep:
+            self.discard(entry)
+
+    def discard(self, entry: dict):
+        """Close a driver that should not be reused"""
+        with self._lock:
+            if entry not in self._live:
+                return
+            self._live.remove(entry)
+        try:
+            entry["driver"].quit()
+        except Exception:
+            pass
+        finally:
+            # Free the profile directory for the next driver
+            if entry.get("profile_lock"):
+                entry["profile_lock"].release()
+
+    def close(self):
+        """Stop the refresher and close all idle drivers; checked-out ones close on release"""
+        with self._lock:
+            self._closed.set()
+        while True:
+            try:
+                self.discard(self._pool.get_nowait())
+            except queue.Empty:
+                break
+
+    def shutdown(self):
+        """Close every driver, including ones still checked out"""
+        self.close()
+        with self._lock:
+            live = list(self._live)
+        for entry in live:
+            self.discard(entry)
+
+    def _refresh_loop(self):
+        while not self._closed.wait(self.refresh_interval):
+            for _ in range(self._pool.qsize()):
+                try:
+                    entry = self._pool.get_nowait()
+                except queue.Empty:
+                    break
+                if self.is_stale(entry):
+                    try:
+                        login(entry["driver"])
+                        save_cookies(entry["driver"])
+                        entry["logged_in_at"] = time.time()
+                    except Exception:
+                        self.discard(entry)
+                        continue
+                self.release(entry)
+
+
+_pools = weakref.WeakSet()
+
+@atexit.register
+def shutdown_pool():
+    """Quit every pooled Chrome process when the interpreter exits"""
+    for pool in list(_pools):
+        pool.shutdown()
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def default_pool() -> DriverPool:
+    """Module-level pool shared by callers that do not supply their own"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool()
+        return _default_pool
+
+class MorningstarClient:
+    """HTTP/2 client for Morningstar fund pages, authenticated with browser cookies"""
+
+    def __init__(self):
+        # One HTTP/2 connection is multiplexed across all fund page requests
+        self.session = httpx.Client(
+            http2=True, timeout=15.0, follow_redirects=True,
+            headers={"Accept-Encoding": "gzip, br"},
+        )
+        self.authenticated = False
+        # Cleared once a fund page comes back without any data point: the SPA then fills them
+        # in client-side, so further static fetches would only add a request before the browser
+        self.serves_static_data = True
+
+    def load_cookies(self, driver):
+        """Copy the cookies of a logged-in Selenium session"""
+        self.set_cookies(driver.get_cookies(), driver.execute_script("return navigator.userAgent"))
+
+    def load_saved_session(self) -> bool:
+        """Pick up the cookies persisted by an earlier browser login, if still fresh"""
+        session = load_saved_session()
+        if session is None:
+            return False
+        self.set_cookies(session["cookies"], session["user_agent"])
+        return True
+
+    def set_cookies(self, cookies: list, user_agent: str):
+        # Present as the same browser the cookies were issued to
+        self.session.headers["User-Agent"] = user_agent
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain", ""), path=cookie.get("path", "/"),
+            )
+        self.authenticated = True
+
+    def fetch(self, url: str, data_points: list) -> dict:
+        """Fetch a fund page and extract the data points present in its HTML"""
+        resp = self.session.get(url)
+        resp.raise_for_status()
+        return extract_from_html(resp.content, data_points)
+
+
+def extract_from_html(html, data_points: list) -> dict:
+    """Extract data points from a page snapshot, skipping any that are missing"""
+    tree = lxml.html.fromstring(html)
+    results = {}
+    for data_point in data_points:
+        nodes = COMPILED_XPATHS[data_point](tree)
+        text = nodes[0].text_content().strip() if nodes else ""
+        if text:
+            results[data_point] = text
+    return results
+
+
+# Fund name -> fund page URL resolved through the search bar, backed by CACHE across restarts
+_fund_urls = {}
+
+def _fund_key(fund: str) -> str:
+    return fund.strip().lower()
+
+def fund_url(fund: str):
+    """Previously resolved fund page URL, or None if the fund has to be searched for"""
+    key = _fund_key(fund)
+    if key not in _fund_urls:
+        url = CACHE.get(fund, "fund_url")
+        if url is None:
+            return None
+        _fund_urls[key] = url
+    return _fund_urls[key]
+
+def remember_fund_url(fund: str, url: str):
+    _fund_urls[_fund_key(fund)] = url
+    CACHE.set(fund, "fund_url", url)
+
+def forget_fund_url(fund: str):
+    _fund_urls.pop(_fund_key(fund), None)
+    CACHE.delete(fund, "fund_url")
+
+_default_client = None
+
+def default_client() -> MorningstarClient:
+    global _default_client
+    with _default_pool_lock:
+        if _default_client is None:
+            _default_client = MorningstarClient()
+            # Lets the static-HTML path run before any browser has logged in this process
+            _default_client.load_saved_session()
+        return _default_client
+
+class PlaywrightSession:
+    """Headless Chromium driven through Playwright, reusing one logged-in BrowserContext
+
+    Playwright's sync API is bound to the thread that started it, so every
+    browser call runs on a dedicated worker thread and lookups are serialized.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self.logged_in_at = 0.0
+        # A plain thread rather than an executor, so close() still reaches it from atexit
+        self._tasks = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def fetch(self, fund: str, data_points: list, client: MorningstarClient) -> dict:
+        try:
+            return self._call(self._fetch, fund, data_points, client)
+        except Exception as e:
+            # Start over with a fresh context (and login) on the next lookup
+            if not self._closed:
+                self._call(self._recover)
+            return {dp: f"Error: {str(e)}" for dp in data_points}
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            # Stop the browser, then the worker; nothing can be queued behind them
+            stopped = Future()
+            self._tasks.put((stopped, self._stop, ()))
+            self._tasks.put(None)
+        self._worker.join()
+        stopped.result()
+
+    def _call(self, fn, *args):
+        """Run fn on the worker thread and wait for its result"""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("browser session is closed")
+            self._tasks.put((future, fn, args))
+        return future.result()
+
+    def _run(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            future, fn, args = task
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _ensure_context(self):
+        if self._browser is None:
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(
+                headless=True, args=CHROME_FLAGS,
+            )
+        if self._context is None:
+            self._context = self._browser.new_context(viewport={"width": 1920, "height": 1080})
+            self._context.add_init_script(PAGE_SCRIPTS_JS)
+            self._context.route("**/*", self._route)
+            self.logged_in_at = 0.0
+
+    @staticmethod
+    def _route(route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+
+    def _login(self, page):
+        username, password = _creds()
+        page.goto("https://premium.morningstar.com.au/auth/logout", wait_until="domcontentloaded")
+        page.click("xpath=//span[text()='Sign-In']")
+        page.fill("#username", username)
+        page.click("xpath=//button[contains(@class,'_button-login-id')]")
+        page.fill("#password", password)
+        page.click("xpath=//button[contains(@class,'_button-login-password')]")
+        page.wait_for_selector('input[placeholder="Search..."]')
+        self.logged_in_at = time.time()
+
+    def _fetch(self, fund: str, data_points: list, client: MorningstarClient) -> dict:
+        self._ensure_context()
+        page = self._context.new_page()
+        try:
+            url = fund_url(fund)
+            if time.time() - self.logged_in_at > SESSION_MAX_AGE:
+                self._login(page)
+            elif url is None:
+                page.goto(HOME_URL, wait_until="domcontentloaded")
+            
+            if url is None:
+                # Search fund and go straight to the first suggestion's page
+                page.click('input[placeholder="Search..."]')
+                page.fill('input[placeholder="Search securities and site"]', fund)
+                href = page.get_attribute('div.mds-search-results__mca.search-results__mca ul.mds-list-group__mca li a', "href")
+                url = urljoin(page.url, href)
+            page.goto(url, wait_until="domcontentloaded")
+            try:
+                page.click("xpath=" + XPATHS["overview_tab"])
+            except PlaywrightError:
+                # A remembered URL that no longer leads to a fund page is searched for next time
+                forget_fund_url(fund)
+                raise
+            remember_fund_url(fund, page.url)
+            client.set_cookies(self._context.cookies(), page.evaluate("navigator.userAgent"))
+            
+            # Same batched extraction as the Selenium path, polled until every data point has text
+            try:
+                page.wait_for_function(
+                    "keys => Object.values(window.__extract(keys)).every(Boolean)",
+                    arg=data_points, timeout=10000,
+                )
+            except PlaywrightError:
+                pass
+            texts = page.evaluate("keys => window.__extract(keys)", data_points)
+        finally:
+            page.close()
         
-        # Extract each data point
+        results = {}
         for data_point in data_points:
+            if texts.get(data_point):
+                results[data_point] = texts[data_point]
+                CACHE.set(fund, data_point, texts[data_point])
+            else:
+                results[data_point] = f"Error: {data_point} not found on the fund page"
+        return results
+
+    def _reset_context(self):
+        if self._context is not None:
             try:
-                text = click_and_extract(driver, XPATHS[data_point])
-                results[data_point] = text
-            except Exception as e:
-                results[data_point] = f"Error: {str(e)}"
-        
+                self._context.close()
+            except PlaywrightError:
+                pass
+            self._context = None
+
+    def _recover(self):
+        self._reset_context()
+        # A crashed or disconnected Chromium cannot open new contexts; relaunch it next time
+        if self._browser is not None and not self._browser.is_connected():
+            self._stop()
+
+    def _stop(self):
+        self._reset_context()
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except PlaywrightError:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+
+_default_playwright = None
+
+def default_playwright() -> PlaywrightSession:
+    global _default_playwright
+    with _default_pool_lock:
+        if _default_playwright is None:
+            _default_playwright = PlaywrightSession()
+            atexit.register(_default_playwright.close)
+        return _default_playwright
+
+def acquire_driver(pool: DriverPool = None) -> dict:
+    return (pool or default_pool()).acquire()
+
+def release_driver(entry: dict, pool: DriverPool = None):
+    (pool or default_pool()).release(entry)
+
+def fetch_data(fund: str, data_point: str) -> str:
+    return fetch_multiple_data(fund, [data_point])[data_point]
+
+def fetch_multiple_data(fund: str, data_points: list, pool: DriverPool = None,
+                        client: MorningstarClient = None) -> dict:
+    """Fetch multiple data points from the cache, plain HTTP, or the browser, in that order"""
+    client = client or default_client()
+    results = {}
+    for data_point in data_points:
+        cached = CACHE.get(fund, data_point)
+        if cached is not None:
+            results[data_point] = cached
+    
+    missing = [dp for dp in data_points if dp not in results]
+    url = fund_url(fund)
+    if missing and url and client.authenticated and client.serves_static_data:
+        try:
+            fetched = client.fetch(url, missing)
+        except httpx.HTTPError:
+            # Failed requests fall back to the browser and may succeed next time
+            fetched = None
+        except lxml.etree.ParserError:
+            # Unparseable bodies (e.g. an empty 200) count as a page without data
+            fetched = {}
+        if fetched == {}:
+            logger.info("Static fund page for %s had none of %s; using the browser from now on", fund, missing)
+            client.serves_static_data = False
+        fetched = fetched or {}
+        for data_point, value in fetched.items():
+            CACHE.set(fund, data_point, value)
+        results.update(fetched)
+    
+    # Anything the static HTML did not contain goes through the browser
+    missing = [dp for dp in data_points if dp not in results]
+    if missing and SCRAPER_BACKEND == "playwright" and sync_playwright is not None:
+        results.update(default_playwright().fetch(fund, missing, client))
+    elif missing:
+        results.update(_fetch_with_driver(fund, missing, pool or default_pool(), client))
+    return results
+
+def fetch_many_funds(funds: list, data_points: list, pool: DriverPool = None,
+                     client: MorningstarClient = None, max_concurrency: int = MAX_CONCURRENCY) -> dict:
+    """Fetch the same data points for several funds, at most max_concurrency at a time"""
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = {
+            fund: executor.submit(fetch_multiple_data, fund, data_points, pool, client)
+            for fund in funds
+        }
+        return {fund: future.result() for fund, future in futures.items()}
+
+def retry_once(fn, *args):
+    """Run fn, repeating it once after a transient Selenium failure"""
+    try:
+        return fn(*args)
+    except (TimeoutException, StaleElementReferenceException):
+        return fn(*args)
+
+def _fetch_with_driver(fund: str, data_points: list, pool: DriverPool, client: MorningstarClient) -> dict:
+    """Fetch multiple data points in a single browser session"""
+    entry = acquire_driver(pool)
+    healthy = False
+    
+    try:
+        results = retry_once(_scrape_fund, entry, pool, fund, data_points, client)
+        healthy = True
         return results
         
     except Exception as e:
         # Return error for all requested data points
         return {dp: f"Error: {str(e)}" for dp in data_points}
     finally:
-        # Always close the driver
-        driver.quit()
+        # Only hand the session back if it is in a known-good state
+        if healthy:
+            release_driver(entry, pool)
+        else:
+            pool.discard(entry)
+
+def search_fund(driver, fund: str) -> str:
+    """Find a fund through the search bar and return the first suggestion's page URL"""
+    wait = WebDriverWait(driver, 15)
+    main_search = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[placeholder="Search..."]')))
+    main_search.click()
+    
+    # Wait for secondary search input
+    sec_search = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'input[placeholder="Search securities and site"]')))
+    
+    def type_fund():
+        sec_search.clear()
+        sec_search.send_keys(fund)
+    type_fund()
+    # Open the first suggestion's link directly rather than clicking through the SPA router.
+    # Reloading would close the search overlay, so a late suggestion list is re-triggered by retyping
+    suggestion = retry_wait(driver, EC.presence_of_element_located(
+        (By.CSS_SELECTOR, 'div.mds-search-results__mca.search-results__mca ul.mds-list-group__mca li a')
+    ), recover=type_fund)
+    return suggestion.get_attribute('href')
+
+def _scrape_fund(entry: dict, pool: DriverPool, fund: str, data_points: list, client: MorningstarClient) -> dict:
+    """Open a fund's page and extract its data points, raising if the page never gets there"""
+    driver = entry["driver"]
+    url = fund_url(fund)
+    # Reuse the pooled session unless it is due for a fresh login
+    if pool.is_stale(entry):
+        start_session(driver)
+        entry["logged_in_at"] = time.time()
+    elif url is None:
+        navigate(driver, HOME_URL)
+    
+    # Funds seen before go straight to their page; new ones are searched for once
+    if url is None:
+        url = search_fund(driver, fund)
+    navigate(driver, url)
+    
+    # Wait for the fund page to settle: Overview tab and the first data point present together.
+    # Overview is the default tab, so once both are there the tab click can be skipped
+    try:
+        WebDriverWait(driver, 5).until(EC.all_of(
+            EC.presence_of_element_located((By.XPATH, XPATHS['overview_tab'])),
+            EC.presence_of_element_located(locator(data_points[0])),
+        ))
+        driver.__dict__["_on_overview"] = True
+    except TimeoutException:
+        try:
+            retry_wait(driver, EC.presence_of_element_located((By.XPATH, XPATHS['overview_tab'])))
+        except TimeoutException:
+            # A remembered URL that no longer leads to a fund page is searched for on retry
+            forget_fund_url(fund)
+            raise
+    # Remember the page so later lookups can skip the search, or the browser entirely
+    remember_fund_url(fund, driver.current_url)
+    client.load_cookies(driver)
+    
+    # Open the Overview tab once, then read every data point in a single script call
+    open_overview(driver)
+    results = extract_all(driver, data_points)
+    
+    # Sections not rendered yet are polled together rather than one timeout each
+    missing = [dp for dp in data_points if dp not in results]
+    if missing:
+        results.update(wait_for_data_points(driver, missing))
+    
+    for data_point, text in results.items():
+        CACHE.set(fund, data_point, text)
+    for data_point in data_points:
+        results.setdefault(data_point, f"Error: {data_point} not found on the fund page")
+    return results
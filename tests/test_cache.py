@@ -0,0 +1,71 @@
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from cache import FileCache
+
+
+class FileCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = FileCache(tmp.name, {"mer": 60}, default_ttl=3600)
+
+    def test_set_then_get(self):
+        self.cache.set("Vanguard High Growth", "mer", "0.29%")
+        self.assertEqual(self.cache.get("Vanguard High Growth", "mer"), "0.29%")
+
+    def test_fund_name_is_normalized(self):
+        self.cache.set("Vanguard High Growth", "mer", "0.29%")
+        self.assertEqual(self.cache.get("  vanguard high growth ", "mer"), "0.29%")
+
+    def test_missing_entry(self):
+        self.assertIsNone(self.cache.get("Vanguard High Growth", "mer"))
+
+    def test_entry_expires_after_its_ttl(self):
+        self.cache.set("Vanguard High Growth", "mer", "0.29%")
+        self.cache.set("Vanguard High Growth", "performance", "8.1%")
+        later = time.time() + 120
+        with mock.patch("cache.time.time", return_value=later):
+            self.assertIsNone(self.cache.get("Vanguard High Growth", "mer"))
+            # Data points without their own TTL fall back to default_ttl
+            self.assertEqual(self.cache.get("Vanguard High Growth", "performance"), "8.1%")
+
+    def test_delete(self):
+        self.cache.set("Vanguard High Growth", "mer", "0.29%")
+        self.cache.delete("Vanguard High Growth", "mer")
+        self.cache.delete("Vanguard High Growth", "mer")
+        self.assertIsNone(self.cache.get("Vanguard High Growth", "mer"))
+
+    def test_clear_drops_one_data_point_for_every_fund(self):
+        self.cache.set("Vanguard High Growth", "mer", "0.29%")
+        self.cache.set("iShares Core", "mer", "0.09%")
+        self.cache.set("Vanguard High Growth", "performance", "8.1%")
+        self.cache.clear("mer")
+        self.assertIsNone(self.cache.get("Vanguard High Growth", "mer"))
+        self.assertIsNone(self.cache.get("iShares Core", "mer"))
+        self.assertEqual(self.cache.get("Vanguard High Growth", "performance"), "8.1%")
+
+    def test_concurrent_writes_to_one_key(self):
+        errors = []
+        def write(n):
+            try:
+                for i in range(100):
+                    self.cache.set("Vanguard High Growth", "mer", f"{n}-{i}")
+            except OSError as e:
+                errors.append(e)
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertIsNotNone(self.cache.get("Vanguard High Growth", "mer"))
+        self.assertEqual(list(self.cache.directory.glob("*.tmp")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
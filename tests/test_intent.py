@@ -0,0 +1,61 @@
+import unittest
+
+from intent import classify_intent
+
+
+class ClassifyIntentTest(unittest.TestCase):
+
+    def assertFund(self, query, fund, data_points, known_funds=()):
+        self.assertEqual(
+            classify_intent(query, known_funds),
+            {"fund": fund, "data_points": data_points},
+        )
+
+    def test_single_fund(self):
+        self.assertFund("What is the MER of Vanguard High Growth?", "Vanguard High Growth", ["mer"])
+
+    def test_several_data_points(self):
+        self.assertFund("MER and performance of IOZ?", "IOZ", ["mer", "performance"])
+
+    def test_ampersand_and_of_join_a_name(self):
+        self.assertFund("fees of Perpetual Industrial Share & Income", "Perpetual Industrial Share & Income", ["mer"])
+
+    def test_no_data_point_goes_to_the_model(self):
+        self.assertIsNone(classify_intent("Tell me about Vanguard High Growth"))
+
+    def test_comparison_goes_to_the_model(self):
+        self.assertIsNone(classify_intent("Compare the MER of IOZ vs VAS"))
+
+    def test_and_separated_funds_go_to_the_model(self):
+        self.assertIsNone(classify_intent("What is the MER of IOZ and VAS?"))
+
+    def test_comma_separated_funds_go_to_the_model(self):
+        self.assertIsNone(classify_intent("MER for Vanguard High Growth, Vanguard Balanced and IOZ?"))
+
+    def test_several_known_funds_go_to_the_model(self):
+        self.assertIsNone(classify_intent("fees of ioz and vas", {"IOZ", "VAS"}))
+
+    def test_trailing_data_point_is_not_part_of_the_name(self):
+        self.assertFund("Tell me about Vanguard's MER", "Vanguard", ["mer"])
+
+    def test_name_ends_at_sentence_punctuation(self):
+        self.assertFund("MER for IOZ. What About Fees", "IOZ", ["mer"])
+
+    def test_data_point_alone_is_not_a_fund(self):
+        self.assertIsNone(classify_intent("Tell me about MER"))
+
+    def test_known_fund_matches_lowercase_query(self):
+        self.assertFund("what are the fees of ioz", "IOZ", ["mer"], {"IOZ"})
+
+    def test_known_fund_only_matches_whole_words(self):
+        self.assertFund("fees of BIOZ Fund", "BIOZ Fund", ["mer"], {"IOZ"})
+
+    def test_longer_typed_name_wins_over_known_prefix(self):
+        self.assertFund(
+            "What is the MER of Vanguard Diversified High Growth?",
+            "Vanguard Diversified High Growth", ["mer"], {"Vanguard"},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()